@@ -4,16 +4,359 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
+import hashlib
+import io
+import logging
+import os
+import urllib.request
+import uuid
+from functools import partial
+
+from cache import ResultCache
+from disk_cache import DiskCache
+import figures
+from prewarm import Prewarmer
+from query import QueryEngine, QueryError, normalize_sql
+from search import SearchIndex
 
 # Set page title and icon
 st.set_page_config(page_title="Smartphone Data Analysis", page_icon="📱")
 
+file_path = r"https://raw.githubusercontent.com/soliloquy-data/Smartphone-Analysis-Dashboard/refs/heads/main/Data/data_refined.csv"  # Adjust this to your file path
+file_path_1 = r"https://raw.githubusercontent.com/soliloquy-data/Smartphone-Analysis-Dashboard/refs/heads/main/Data/data_refined_user.csv"
+
+# Price bins used by "Price Range Distribution by Brand and Year"
+price_bins = [0, 15000, 30000, 50000, 75000, 100000, 125000, 150000, 200000]  # Price ranges (0-15k, 15k-30k, ...)
+price_labels = ['0-15k', '15k-30k', '30k-50k', '50k-75k', '75k-1L', '1L-1.25L', '1.25L-1.5L', '1.5L-2L']
+# Price bins used by "Your Smartphone, Your Criteria"
+price_bins_1 = [0, 10000, 15000, 20000, 30000, 40000, 50000, 60000, 70000, 80000, 90000, 100000, 125000, 150000, 200000]
+price_labels_1 = ['0-10k', '10k-15k', '15k-20k', '20k-30k', '30k-40k', '40k-50k', '50k-60k', '60k-70k', '70k-80k', '80k-90k', '90k-1L', '1L-1.25L', '1.25L-1.5L', '1.5L-2L']
+# Features to color the "Price vs Model Name" bars by
+feature_options = ['RAM (GB)', 'ROM (GB)','Processor Brand' ,'Battery Capacity (mAh)','Total Front Camera Megapixels','Total Rear Camera Megapixels',
+                  'Display Size (cm)','Fast Charge Capacity (W)','5G Support', 'Fingerprint Sensor', 'NFC Support']
+
+
+# Load a dataset, along with a hash of the raw file used to version cached results. The file
+# is fetched again every 10 minutes so upstream changes show up without a restart; the parsed
+# frame is kept on disk only (st.cache_data already holds it in memory), so a refresh or a
+# restart with unchanged content only re-reads the CSV, it does not re-parse it.
+@st.cache_data(ttl=600, show_spinner=False)
+def load_dataset(path):
+    if path.startswith(('http://', 'https://')):
+        with urllib.request.urlopen(path) as response:
+            raw = response.read()
+    else:
+        with open(path, 'rb') as fh:
+            raw = fh.read()
+    version = hashlib.sha1(raw).hexdigest()[:16]
+    store = get_cache().store
+    key = cache_key('dataset', version)
+    data = store.get(key) if store is not None else None
+    if data is None:
+        data = pd.read_csv(io.BytesIO(raw))
+        if store is not None:
+            store.put(key, data)
+    return data, version
+
+
+# Bump a section's version whenever its output changes, so results cached by older code
+# (including those persisted on disk) are no longer used
+section_versions = {'dataset': 1, 'category_pie': 1, 'histogram': 1, 'brand_distribution': 1, 'brand_price': 2,
+                    'price_range': 1, 'os_price_trend': 1, 'brand_price_trend': 1, 'feature_min_price': 1,
+                    'feature_brand_min_price': 1, 'core_count': 1, 'octa_core_table': 1, 'octa_core_donut': 1,
+                    'processor_models': 2, 'criteria': 1, 'criteria_fig': 2, 'query': 2}
+
+
+def cache_key(section, *parts):
+    return (section, section_versions[section]) + parts
+
+
+# Shared across sessions: computed frames/figures and the background prewarmer filling them.
+# Frames and figures are also persisted on disk so restarts and other workers start warm.
+cache_dir = os.environ.get('SMARTPHONE_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'smartphone-dashboard'))
+# Set SMARTPHONE_CACHE_METRICS=1 to show the cache and prewarm metrics in the sidebar
+show_cache_metrics = os.environ.get('SMARTPHONE_CACHE_METRICS') == '1'
+
+
+logger = logging.getLogger(__name__)
+
+
+@st.cache_resource
+def get_cache():
+    # An unusable cache directory (read-only home, bad SMARTPHONE_CACHE_DIR) only costs the
+    # disk layer; the app keeps working with the in-memory cache
+    try:
+        store = DiskCache(cache_dir, max_bytes=512 * 1024 ** 2)
+    except OSError as exc:
+        logger.warning("Disk cache disabled, cannot use %s: %s", cache_dir, exc)
+        store = None
+    return ResultCache(max_bytes=256 * 1024 ** 2, store=store)
+
+
+@st.cache_resource
+def get_prewarmer():
+    return Prewarmer(get_cache(), budget_bytes=128 * 1024 ** 2)
+
+
+# Count a widget state towards the prewarm ranking only when the user has just picked it,
+# not on every rerun it stays on screen; the untouched initial state is never counted
+def record_pick(section, state):
+    previous = st.session_state.get(f'last_pick_{section}')
+    st.session_state[f'last_pick_{section}'] = state
+    if previous is not None and previous != state:
+        get_prewarmer().record_access((section,) + state)
+
+
+# SQLite engine for the Ad-hoc Query page, rebuilt only when a dataset version changes
+@st.cache_resource(max_entries=1, show_spinner=False)
+def get_query_engine(versions, _tables):
+    return QueryEngine(_tables)
+
+
+# Model name search index for the User-centric page, built once per dataset version
+@st.cache_resource(max_entries=1, show_spinner=False)
+def get_search_index(version, _frame):
+    return SearchIndex(_frame)
+
+
+# Charts for "Visualizations of the features in the dataset" and "Brand Distribution"
+def category_pie_figure(df, column):
+    # Create the DataFrame for the chosen column, and count the occurrences
+    dt = df[column].value_counts().reset_index(name='Count')
+    dt.columns = [column, 'Count']
+    # Plot Pie Chart for the chosen column
+    return figures.pie(dt, values='Count', names=column, hover_data=['Count'],
+            title=f'Pie Chart of {column}')
+
+
+def histogram_figure(df, column):
+    ht = figures.histogram(df, x=column, title=f'Histogram of {column}',template='plotly_dark',nbins=30)
+    ht.update_layout(bargap=0.3)
+    return ht
+
+
+def brand_distribution_figure(df):
+    temp=df['Brand'].value_counts().reset_index(name='Count of Phones')
+    return figures.bar(temp, x='Brand',y='Count of Phones', title='Brand Distribution', color='Brand')
+
+
+# Charts for "Brand Price & Count Analysis"
+def brand_price_figures(df, brand):
+    # Filter the DataFrame based on the selected brand and select relevant columns
+    dt = df[df['Brand'] == brand][['Model Name', 'Release Year', 'Price (INR)']]
+    # Create a bar plot showing the price trend for the selected brand
+    bary = figures.bar(dt, x='Release Year', y='Price (INR)', title=f"Increase in {brand} Phone Price by Year",
+              labels={'Model Name': 'Model', 'Price (INR)': 'Phone Price (INR)'}, hover_data={'Model Name': True, 'Price (INR)': True, 'Release Year': False})
+    # Format the y-axis to display prices in a more readable way
+    bary.update_layout(yaxis=dict(tickformat=",.0f"))
+    # Group by 'Release Year' and 'Model Name' to get the count of phones for each model per year
+    dt1 = dt.groupby(['Release Year', 'Model Name']).size().reset_index(name='Count of Phones')
+    # Create a bar plot with the count of phones released by the selected brand per year, partitioned by phone models
+    bar = figures.bar(dt1, x='Release Year', y='Count of Phones', color='Model Name',
+             title=f"Increase in {brand} Phones Released Year by Year",
+             labels={'Model Name': 'Model'}, hover_data={'Model Name': True, 'Release Year': False, 'Count of Phones': False})
+    return bary, bar
+
+
+def brand_price_tasks(df, version):
+    # Most common brands first
+    return [(('brand_price', brand), cache_key('brand_price', version, brand), partial(brand_price_figures, df, brand), int(count))
+            for brand, count in df['Brand'].value_counts().items()]
+
+
+# Chart for "Price Range Distribution by Brand and Year"
+def price_range_figure(df, brand, year):
+    # Filter data for the selected year and brand, and count phones per price bin
+    df_filtered = df.loc[(df['Release Year'] == year) & (df['Brand'] == brand)]
+    df_filtered = df_filtered.assign(price_range=pd.cut(df_filtered['Price (INR)'], bins=price_bins, labels=price_labels, right=False))
+    price_range_count = df_filtered['price_range'].value_counts().reset_index(name='Count')
+    return figures.bar(price_range_count, x='price_range', y='Count', title=f"Phone Price Range Distribution for {year}",
+               labels={'price_range': 'Price Range', 'Count': 'Count of Phones'})
+
+
+# Charts for "Price Trends"
+def os_price_trend_figure(df):
+    # For Android devices
+    temp_android = df[df['Operating System Type'] == 'Android']
+    temp_android = temp_android.groupby('Release Year')['Price (INR)'].mean().reset_index()
+    temp_android['os_type'] = 'Android'  # Labeling the operating system
+
+    # For iOS devices
+    temp_ios = df[df['Operating System Type'] == 'iOS']
+    temp_ios = temp_ios.groupby('Release Year')['Price (INR)'].mean().reset_index()
+    temp_ios['os_type'] = 'iOS'  # Labeling the operating system
+
+    # Combine both Android and iOS datasets
+    combined_temp = pd.concat([temp_android, temp_ios])
+
+    # Plotting the price trends
+    return figures.line(combined_temp, x='Release Year', y='Price (INR)', color='os_type',
+              title="Price Trends for Android and iOS Devices Over the Years",
+              labels={'Price (INR)': 'Average Price', 'Release Year': 'Release Year'},
+                line_shape='linear', colors=['#FF007F','#00BFFF'])
+
+
+def brand_price_trend_figure(df, brands):
+    filtered_df = df[df['Brand'].isin(brands)]
+    price_trends = filtered_df.groupby(['Release Year', 'Brand']).agg(mean_price=('Price (INR)', 'mean')).reset_index()
+    return figures.line(price_trends, x='Release Year', y='mean_price', color='Brand',
+             title="Average Price Trends for Selected Brands Over the Years",
+             labels={'mean_price': 'Average Price', 'release_year': 'Release Year'})
+
+
+# Charts for "Analyzing Price Growth for Phones with 5G, NFC, and Fast Charging"
+def feature_min_price_figure(df, feature):
+    # Filter the data for phones with the selected feature
+    temp_df = df[df[feature] == 'Yes'][['Release Year', 'Price (INR)', 'Brand', 'Model Name']]
+    # Group by 'Release Year', find the minimum price, and get the phone name for the minimum price
+    df_grouped = temp_df.loc[temp_df.groupby('Release Year')['Price (INR)'].idxmin()][['Release Year', 'Price (INR)', 'Model Name']].reset_index(drop=True)
+    # Create a line plot to show the trend of prices over the years
+    return figures.line(df_grouped, x='Release Year', y='Price (INR)',
+              title=f'Price Trend of Phones with {feature} over Time',
+              labels={'Release Year': 'Release Year', 'Price (INR)': 'Minimum Price (INR)'},
+              markers=True, hover_data={'Price (INR)': True, 'Model Name': True},
+              line_shape='spline', colors=['#FF007F'])  # Include name on hover
+
+
+def feature_brand_min_price_figure(df, feature, brands):
+    temp_df = df[df[feature] == 'Yes'][['Release Year', 'Price (INR)', 'Brand', 'Model Name']]
+    temp_df_brands = temp_df[temp_df['Brand'].isin(brands)]
+    # Group by 'Release Year' and get the minimum price for each brand, then reset the index
+    df_grouped = temp_df_brands.loc[temp_df_brands.groupby(['Release Year', 'Brand'])['Price (INR)'].idxmin()]\
+                           [['Release Year', 'Price (INR)', 'Brand', 'Model Name']].reset_index(drop=True)
+    # Create a line plot with the selected brands
+    return figures.line(df_grouped, x='Release Year', y='Price (INR)', color='Brand',
+              title=f'Price Trend of Phones for Selected Brands with {feature} Over Time',
+              labels={'Release Year': 'Release Year', 'Price (INR)': 'Minimum Price (INR)', 'Brand': 'Brand'},
+              markers=True, hover_data={'Price (INR)': True, 'Model Name': True}, line_shape='spline')
+
+
+# Charts and table for "The Octa Core Era"
+def core_count_figure(df_period, years):
+    fig = figures.bar(df_period.groupby('Number of Cores')['Processor Brand'].value_counts().reset_index(),
+             x='Number of Cores', y='count', color='Processor Brand',
+             title=f"Core Count vs Processor Brand Distribution ({years})")
+    fig.update_layout(xaxis_title='Number of Cores', yaxis_title='Count of Processors')
+    return fig
+
+
+def octa_core_table(df_3):
+    # Filter the dataset for Octa-Core processors
+    temp_0 = df_3[df_3['Number of Cores'] == 'Octa']
+    # Group by processor brand and aggregate the price information
+    temp_0 = temp_0.groupby('Processor Brand').agg({'Price (INR)': ['mean', 'median', 'min', 'max', 'count']}).reset_index()
+    temp_0 = np.round(temp_0, 0)
+    # Rename the columns for easier access
+    temp_0.columns = ['Processor Brand', 'Mean Price', 'Median Price', 'Min Price', 'Max Price', 'Count']
+    # Calculate the variance (max - min) for price
+    temp_0['Variance (Max-Min)'] = temp_0['Max Price'] - temp_0['Min Price']
+    # Reset index and set 'Processor Brand' as index for better readability
+    temp_0.reset_index(drop=True, inplace=True)
+    temp_0.set_index('Processor Brand', inplace=True)
+    # Sorted by 'Count', 'Variance (Max-Min)', and 'Mean Price'
+    return temp_0.sort_values(by=['Count', 'Variance (Max-Min)', 'Mean Price'], ascending=[False, False, True])
+
+
+# Donut of Octa-Core phones of one processor brand by `column` ('RAM (GB)' or 'Brand')
+def octa_core_donut_figure(df_3, processor_brand, column, title):
+    temp = df_3[(df_3['Number of Cores'] == 'Octa') & (df_3['Processor Brand'] == processor_brand)]
+    distribution = temp.groupby(column).agg(price=('Price (INR)', 'mean'), count=(column, 'size')).reset_index()
+    distribution.rename(columns={'price': 'Mean Price'}, inplace=True)
+    distribution['Mean Price'] = distribution['Mean Price'].round(0)
+    return figures.pie(distribution, names=column, values='count', title=title,
+             hover_data={'Mean Price': True}, hole=0.4)
+
+
+# Table for "Your Smartphone, Your Criteria"
+def criteria_table(df1, brand, year, price_range):
+    df_year = df1
+    if brand != 'All Brands':
+        df_year = df_year[df_year['Brand'] == brand]
+    if year != 'All years':
+        df_year = df_year[df_year['Release Year'] == year]
+    # Apply price bins to the data
+    df_year = df_year.assign(**{'Price Range': pd.cut(df_year['Price (INR)'], bins=price_bins_1, labels=price_labels_1, right=False)})
+    # Filter data based on the selected price range and sort data by 'Price (INR)'
+    filtered_df = df_year[df_year['Price Range'] == price_range].sort_values(by='Price (INR)', ascending=False)
+    # Assign the index to 'Model Name'
+    filtered_df.index = filtered_df['Model Name']
+    return filtered_df
+
+
+def criteria_figure(filtered_df, feature):
+    plot_df = filtered_df.assign(**{feature: filtered_df[feature].astype(str)})
+    # Create a bar plot with dynamic color based on the selected feature
+    return figures.bar(plot_df, x='Model Name', y='Price (INR)',color=feature,
+        title=f"Price vs Model Name Colored by {feature}",
+        labels={"Price (INR)": "Price (INR)", "Model Name": "Phone Model"})
+
+
+def criteria_tasks(df1, version):
+    # Every non-empty (brand, year, price range), including the 'All Brands'/'All years'
+    # choices, weighted by row count; the bar chart (default colouring) only exists when
+    # both a brand and a year are picked
+    frame = df1.assign(price_range=pd.cut(df1['Price (INR)'], bins=price_bins_1, labels=price_labels_1, right=False))
+    # Every visitor starts on the page's default state, so it goes first even when empty
+    default = ('All Brands', 'All years', price_labels_1[0])
+    tasks = [(('criteria',) + default, cache_key('criteria', version, *default),
+              partial(criteria_table, df1, *default), len(df1) + 1)]
+    for by_brand in (True, False):
+        for by_year in (True, False):
+            columns = ['Brand'] * by_brand + ['Release Year'] * by_year + ['price_range']
+            counts = frame.groupby(columns, observed=True).size()
+            for group, count in counts.items():
+                group = list(group) if isinstance(group, tuple) else [group]
+                brand = group.pop(0) if by_brand else 'All Brands'
+                year = group.pop(0) if by_year else 'All years'
+                label = group.pop(0)
+                state = ('criteria', brand, year, label)
+                if state[1:] == default:
+                    continue
+                tasks.append((state, cache_key('criteria', version, brand, year, label),
+                              partial(criteria_table, df1, brand, year, label), int(count)))
+                if by_brand and by_year:
+                    tasks.append((state, cache_key('criteria_fig', version, brand, year, label, feature_options[0]),
+                                  lambda brand=brand, year=year, label=label: criteria_figure(criteria_table(df1, brand, year, label), feature_options[0]),
+                                  int(count)))
+    return tasks
+
+
+# "Processor Model Distribution" chart for one processor brand, as PNG bytes
+def processor_model_png(df_3, processor_brand, label, figsize, legend_fontsize, legend_title_fontsize, markerscale):
+    # Filter for Octa-Core processors of the given brand
+    temp = df_3[(df_3['Number of Cores'] == 'Octa') & (df_3['Processor Brand'] == processor_brand)]
+    # Group by processor model and aggregate count and minimum price
+    temp1 = temp.groupby('Processor Model').agg({'Price (INR)': ['count', 'min']}).reset_index()
+    temp1.columns = ['Processor Model', 'Count', 'Min Price']
+    # Create a bar plot for the Octa-Core processor models
+    sns.set(style="whitegrid")
+    fig, ax = plt.subplots(figsize=figsize)
+    sns.barplot(data=temp1, x='Processor Model', y='Count', hue='Min Price', palette='plasma', ax=ax)
+    ax.set_xlabel('Processor Model', fontsize=25)
+    ax.set_ylabel('Count of Processors', fontsize=25)
+    ax.set_title(f'Count vs Processor Model ({label} Octa-Core)', fontsize=25)
+    plt.xticks(rotation=45, ha="right", fontsize=23)
+    plt.yticks(rotation=45, ha="right", fontsize=23)
+    plt.legend(fontsize=legend_fontsize, title="Min Price", title_fontsize=legend_title_fontsize, loc="upper right", markerscale=markerscale)
+    plt.tight_layout()
+    buf = io.BytesIO()
+    # Same resolution and cropping that st.pyplot used
+    fig.savefig(buf, format='png', dpi=200, bbox_inches='tight')
+    plt.close(fig)
+    return buf.getvalue()
+
+
+# Tell the prewarmer a rerun is in flight; it waits until every session's run has finished
+rerun_session = st.session_state.setdefault('rerun_session', uuid.uuid4().hex)
+get_prewarmer().rerun_started(rerun_session)
+
 # Sidebar for navigation
 st.sidebar.title("Smartphone Data Analysis & Dashboard")  # Sidebar Title
 options = [
     "Intro 🏠", 
     "Overall Analysis 📊", 
-    "User-centric Analysis 👥"
+    "User-centric Analysis 👥",
+    "Ad-hoc Query 🔎"
 ]
 selection = st.sidebar.radio("Choose an option", options)
 
@@ -59,9 +402,9 @@ if selection == "Intro 🏠":
 # Show Overall Analysis
 
 elif selection == "Overall Analysis 📊":
-    # Load the dataset (adjust this to the correct file path)
-    file_path = r"https://raw.githubusercontent.com/soliloquy-data/Smartphone-Analysis-Dashboard/refs/heads/main/Data/data_refined.csv"  # Adjust this to your file path
-    df = pd.read_csv(file_path)
+    # Load the dataset (adjust file_path at the top to the correct file path)
+    df, df_version = load_dataset(file_path)
+    get_prewarmer().schedule(f"brand_price:{df_version}", partial(brand_price_tasks, df, df_version))
 
     st.title("Overall Analysis")
 
@@ -120,12 +463,9 @@ elif selection == "Overall Analysis 📊":
     'Number of Rear Cameras', 'Fingerprint Sensor', 'Number of Front Cameras', 'NFC Support', 'Operating System Type']
     # Select a categorical column to plot pie chart
     chosen_column = st.selectbox("Select a column to plot pie chart", categorical_column)
-    # Create the DataFrame for the chosen column, and count the occurrences
-    dt = df[chosen_column].value_counts().reset_index(name='Count')
-    dt.columns = [chosen_column, 'Count']
     # Plot Pie Chart for the chosen column
-    pr = px.pie(dt, values='Count', names=chosen_column, hover_data=['Count'],
-            title=f'Pie Chart of {chosen_column}')
+    pr = get_cache().get_or_compute(cache_key('category_pie', df_version, chosen_column),
+                                    partial(category_pie_figure, df, chosen_column))
     st.plotly_chart(pr)
     
     #### 2. Numerical Feature Analysis:
@@ -141,8 +481,8 @@ elif selection == "Overall Analysis 📊":
     # Select a numerical column to plot a histogram
     chosen_column = st.selectbox("Select a column to plot histogram", numerical_column)
     # Plot Histogram for the chosen numerical column
-    ht = px.histogram(df, x=chosen_column, title=f'Histogram of {chosen_column}',template='plotly_dark',nbins=30)
-    ht.update_layout(bargap=0.3)
+    ht = get_cache().get_or_compute(cache_key('histogram', df_version, chosen_column),
+                                    partial(histogram_figure, df, chosen_column))
     st.plotly_chart(ht)
 
     st.subheader("Brand Distribution")
@@ -151,8 +491,7 @@ elif selection == "Overall Analysis 📊":
     
     By examining this chart, you can quickly identify which brands are most prevalent in the dataset and gain insights into their relative popularity. 
     """)   
-    temp=df['Brand'].value_counts().reset_index(name='Count of Phones')
-    pr = px.bar(temp, x='Brand',y='Count of Phones', title='Brand Distribution', color='Brand')
+    pr = get_cache().get_or_compute(cache_key('brand_distribution', df_version), partial(brand_distribution_figure, df))
     st.plotly_chart(pr)
 
     #####################################################
@@ -176,13 +515,9 @@ elif selection == "Overall Analysis 📊":
     """)
     ## Update the column names according to the new names
     selected_brand = st.selectbox("Select a brand to view price trend", df['Brand'].sort_values().unique())
-    # Filter the DataFrame based on the selected brand and select relevant columns
-    dt = df[df['Brand'] == selected_brand][['Model Name', 'Release Year', 'Price (INR)']]
-    # Create a bar plot showing the price trend for the selected brand
-    bary = px.bar(dt, x='Release Year', y='Price (INR)', title=f"Increase in {selected_brand} Phone Price by Year", 
-              labels={'Model Name': 'Model', 'Price (INR)': 'Phone Price (INR)'}, hover_data={'Model Name': True, 'Price (INR)': True, 'Release Year': False})
-    # Format the y-axis to display prices in a more readable way
-    bary.update_layout(yaxis=dict(tickformat=",.0f"))
+    record_pick('brand_price', (selected_brand,))
+    bary, bar = get_cache().get_or_compute(cache_key('brand_price', df_version, selected_brand),
+                                           partial(brand_price_figures, df, selected_brand))
     st.plotly_chart(bary)
     st.markdown("""
     ##### 2. Count of Phones Released
@@ -191,12 +526,6 @@ elif selection == "Overall Analysis 📊":
     - The **y-axis** will show the **Count of Phones**, which is the number of phones released each year.
     - Each block of the bar again reprsents the Model name of the phone.
     """)
-    # Group by 'Release Year' and 'Model Name' to get the count of phones for each model per year
-    dt1 = dt.groupby(['Release Year', 'Model Name']).size().reset_index(name='Count of Phones')
-    # Create a bar plot with the count of phones released by the selected brand per year, partitioned by phone models
-    bar = px.bar(dt1, x='Release Year', y='Count of Phones', color='Model Name', 
-             title=f"Increase in {selected_brand} Phones Released Year by Year", 
-             labels={'Model Name': 'Model'}, hover_data={'Model Name': True, 'Release Year': False, 'Count of Phones': False})
     st.plotly_chart(bar)
 
     #####################################################
@@ -217,33 +546,21 @@ elif selection == "Overall Analysis 📊":
     with col2:
         selected_year_2 = st.selectbox("Select a second year to view count trend", df[df['Release Year'] != selected_year_1]['Release Year'].sort_values().unique())
 
-    # Define price bins and labels
-    price_bins = [0, 15000, 30000, 50000, 75000, 100000, 125000, 150000, 200000]  # Price ranges (0-15k, 15k-30k, ...)
-    price_labels = ['0-15k', '15k-30k', '30k-50k', '50k-75k', '75k-1L', '1L-1.25L', '1.25L-1.5L', '1.5L-2L']
-
-    # Filter data for the first selected year and brand
-    df_filtered_1 = df.loc[(df['Release Year'] == selected_year_1) & (df['Brand'] == selected_brand_1)]
-    df_filtered_1['price_range'] = pd.cut(df_filtered_1['Price (INR)'], bins=price_bins, labels=price_labels, right=False)
-    price_range_count_1 = df_filtered_1['price_range'].value_counts().reset_index(name='Count')
-
-    # Filter data for the second selected year and brand
-    df_filtered_2 = df.loc[(df['Release Year'] == selected_year_2) & (df['Brand'] == selected_brand_1)]
-    df_filtered_2['price_range'] = pd.cut(df_filtered_2['Price (INR)'], bins=price_bins, labels=price_labels, right=False)
-    price_range_count_2 = df_filtered_2['price_range'].value_counts().reset_index(name='Count')
+    # Price range bars for both years
+    bar_1 = get_cache().get_or_compute(cache_key('price_range', df_version, selected_brand_1, selected_year_1),
+                                       partial(price_range_figure, df, selected_brand_1, selected_year_1))
+    bar_2 = get_cache().get_or_compute(cache_key('price_range', df_version, selected_brand_1, selected_year_2),
+                                       partial(price_range_figure, df, selected_brand_1, selected_year_2))
 
     # Create two columns for the side-by-side layout
     col1, col2 = st.columns(2)
 
     # Create the first bar chart for the first year in the first column
     with col1:
-        bar_1 = px.bar(price_range_count_1, x='price_range', y='Count', title=f"Phone Price Range Distribution for {selected_year_1}",
-                   labels={'price_range': 'Price Range', 'Count': 'Count of Phones'})
         st.plotly_chart(bar_1)
 
     # Create the second bar chart for the second year in the second column
     with col2:
-        bar_2 = px.bar(price_range_count_2, x='price_range', y='Count', title=f"Phone Price Range Distribution for {selected_year_2}",
-                   labels={'price_range': 'Price Range', 'Count': 'Count of Phones'})
         st.plotly_chart(bar_2)
         
     #################################################
@@ -258,24 +575,8 @@ elif selection == "Overall Analysis 📊":
     
     
     """)
-    # For Android devices
-    temp_android = df[df['Operating System Type'] == 'Android']
-    temp_android = temp_android.groupby('Release Year')['Price (INR)'].mean().reset_index()
-    temp_android['os_type'] = 'Android'  # Labeling the operating system
-
-    # For iOS devices
-    temp_ios = df[df['Operating System Type'] == 'iOS']
-    temp_ios = temp_ios.groupby('Release Year')['Price (INR)'].mean().reset_index()
-    temp_ios['os_type'] = 'iOS'  # Labeling the operating system
-
-    # Combine both Android and iOS datasets
-    combined_temp = pd.concat([temp_android, temp_ios])
-
     # Plotting the price trends
-    fig = px.line(combined_temp, x='Release Year', y='Price (INR)', color='os_type',
-              title="Price Trends for Android and iOS Devices Over the Years",
-              labels={'Price (INR)': 'Average Price', 'Release Year': 'Release Year'},
-                line_shape='linear', color_discrete_sequence=['#FF007F','#00BFFF'])
+    fig = get_cache().get_or_compute(cache_key('os_price_trend', df_version), partial(os_price_trend_figure, df))
     st.plotly_chart(fig)
     st.markdown("""
     The effect of pandemic appears to have temporarily influenced the pricing trend. For Android, the shift to premium models continued, while for iOS, the pandemic led to a brief price drop, followed by a rebound in the post-pandemic period, particularly for premium iPhones.
@@ -292,11 +593,8 @@ elif selection == "Overall Analysis 📊":
     """)
     selected_brands = st.multiselect("Select  brands to view average price trends",df['Brand'].sort_values().unique())
     if len(selected_brands) > 0:
-         filtered_df = df[df['Brand'].isin(selected_brands)]
-         price_trends = filtered_df.groupby(['Release Year', 'Brand']).agg(mean_price=('Price (INR)', 'mean')).reset_index()
-         fig = px.line(price_trends, x='Release Year', y='mean_price', color='Brand',
-                  title="Average Price Trends for Selected Brands Over the Years",
-                  labels={'mean_price': 'Average Price', 'release_year': 'Release Year'})
+         fig = get_cache().get_or_compute(cache_key('brand_price_trend', df_version, tuple(selected_brands)),
+                                          partial(brand_price_trend_figure, df, selected_brands))
          st.plotly_chart(fig)
     else:
         st.write("Please select brand to view the trends.")
@@ -316,16 +614,9 @@ elif selection == "Overall Analysis 📊":
     # Updated feature list based on renamed columns
     feature = ['Fast Charge Availability', '5G Support', 'NFC Support']
     select_feature = st.selectbox("Select a feature to view the min price trend", feature)
-    # Filter the data for phones with the selected feature
-    temp_df = df[df[select_feature] == 'Yes'][['Release Year', 'Price (INR)', 'Brand', 'Model Name']]
-    # Group by 'Release Year', find the minimum price, and get the phone name for the minimum price
-    df_grouped = temp_df.loc[temp_df.groupby('Release Year')['Price (INR)'].idxmin()][['Release Year', 'Price (INR)', 'Model Name']].reset_index(drop=True)
-    # Create a line plot to show the trend of prices over the years
-    fig = px.line(df_grouped, x='Release Year', y='Price (INR)',
-              title=f'Price Trend of Phones with {select_feature} over Time',
-              labels={'Release Year': 'Release Year', 'Price (INR)': 'Minimum Price (INR)'},
-              markers=True, hover_data={'Price (INR)': True, 'Model Name': True},
-              line_shape='spline', color_discrete_sequence=['#FF007F'])  # Include name on hover
+    # Line plot of the minimum price of phones with the selected feature over the years
+    fig = get_cache().get_or_compute(cache_key('feature_min_price', df_version, select_feature),
+                                     partial(feature_min_price_figure, df, select_feature))
     st.plotly_chart(fig)
     # Multi-select for brands
     st.markdown("""
@@ -333,16 +624,9 @@ elif selection == "Overall Analysis 📊":
     """)
     selected_brands = st.multiselect("Select brands to compare", df['Brand'].sort_values().unique())
     if len(selected_brands) > 0:
-        temp_df = df[df[select_feature] == 'Yes'][['Release Year', 'Price (INR)', 'Brand', 'Model Name']]
-        temp_df_brands = temp_df[temp_df['Brand'].isin(selected_brands)]
-        # Group by 'Release Year' and get the minimum price for each brand, then reset the index
-        df_grouped = temp_df_brands.loc[temp_df_brands.groupby(['Release Year', 'Brand'])['Price (INR)'].idxmin()]\
-                               [['Release Year', 'Price (INR)', 'Brand', 'Model Name']].reset_index(drop=True)
-        # Create a line plot with the selected brands
-        fig = px.line(df_grouped, x='Release Year', y='Price (INR)', color='Brand',
-                  title=f'Price Trend of Phones for Selected Brands with {select_feature} Over Time',
-                  labels={'Release Year': 'Release Year', 'Price (INR)': 'Minimum Price (INR)', 'Brand': 'Brand'},
-                  markers=True, hover_data={'Price (INR)': True, 'Model Name': True}, line_shape='spline')
+        # Line plot of the minimum price per year for each selected brand
+        fig = get_cache().get_or_compute(cache_key('feature_brand_min_price', df_version, select_feature, tuple(selected_brands)),
+                                         partial(feature_brand_min_price_figure, df, select_feature, selected_brands))
         st.plotly_chart(fig, key="price_trend_chart_{}".format("_".join(selected_brands)))
 
     else:
@@ -365,10 +649,7 @@ elif selection == "Overall Analysis 📊":
     df_3 = df[df['Release Year'] >= 2021]
 
     # Plot for the years 2012-2016
-    fig = px.bar(df_1.groupby('Number of Cores')['Processor Brand'].value_counts().reset_index(),
-             x='Number of Cores', y='count', color='Processor Brand',
-             title="Core Count vs Processor Brand Distribution (2012-2016)")
-    fig.update_layout(xaxis_title='Number of Cores', yaxis_title='Count of Processors')
+    fig = get_cache().get_or_compute(cache_key('core_count', df_version, '2012-2016'), partial(core_count_figure, df_1, '2012-2016'))
     st.plotly_chart(fig)
 
     st.markdown("""
@@ -376,10 +657,7 @@ elif selection == "Overall Analysis 📊":
     """)
 
     # Plot for the years 2017-2020
-    fig = px.bar(df_2.groupby('Number of Cores')['Processor Brand'].value_counts().reset_index(),
-             x='Number of Cores', y='count', color='Processor Brand',
-             title="Core Count vs Processor Brand Distribution (2017-2020)")
-    fig.update_layout(xaxis_title='Number of Cores', yaxis_title='Count of Processors')
+    fig = get_cache().get_or_compute(cache_key('core_count', df_version, '2017-2020'), partial(core_count_figure, df_2, '2017-2020'))
     st.plotly_chart(fig)
 
     st.markdown("""
@@ -387,10 +665,7 @@ elif selection == "Overall Analysis 📊":
     """)
 
     # Plot for the years 2021-2024
-    fig = px.bar(df_3.groupby('Number of Cores')['Processor Brand'].value_counts().reset_index(),
-             x='Number of Cores', y='count', color='Processor Brand',
-             title="Core Count vs Processor Brand Distribution (2021-2024)")
-    fig.update_layout(xaxis_title='Number of Cores', yaxis_title='Count of Processors')
+    fig = get_cache().get_or_compute(cache_key('core_count', df_version, '2021-2024'), partial(core_count_figure, df_3, '2021-2024'))
     st.plotly_chart(fig)
 
     st.markdown("""
@@ -403,20 +678,8 @@ elif selection == "Overall Analysis 📊":
     
     ##### The table below provides a detailed breakdown of several **Octa-Core processor brands**:
     """)
-    # Filter the dataset for Octa-Core processors
-    temp_0 = df_3[df_3['Number of Cores'] == 'Octa']
-    # Group by processor brand and aggregate the price information
-    temp_0 = temp_0.groupby('Processor Brand').agg({'Price (INR)': ['mean', 'median', 'min', 'max', 'count']}).reset_index()
-    temp_0 = np.round(temp_0, 0)
-    # Rename the columns for easier access
-    temp_0.columns = ['Processor Brand', 'Mean Price', 'Median Price', 'Min Price', 'Max Price', 'Count']
-    # Calculate the variance (max - min) for price
-    temp_0['Variance (Max-Min)'] = temp_0['Max Price'] - temp_0['Min Price']
-    # Reset index and set 'Processor Brand' as index for better readability
-    temp_0.reset_index(drop=True, inplace=True)
-    temp_0.set_index('Processor Brand', inplace=True)
     # Display the table sorted by 'Count', 'Variance (Max-Min)', and 'Mean Price'
-    st.write(temp_0.sort_values(by=['Count', 'Variance (Max-Min)', 'Mean Price'], ascending=[False, False, True]))
+    st.write(get_cache().get_or_compute(cache_key('octa_core_table', df_version), partial(octa_core_table, df_3)))
     st.markdown("""
     
     The data reveals how these two brands— **Snapdragon** and **MediaTek Dimensity**—dominate the market, both in terms of volume and pricing range
@@ -436,41 +699,13 @@ elif selection == "Overall Analysis 📊":
 
     st.markdown("""<div style="text-align: center;font-size: 25px; font-weight: bold;">Processor Model Distribution </div>""", unsafe_allow_html=True)
     st.markdown("<br>", unsafe_allow_html=True)
-    # Filter for Snapdragon Octa-Core processors
-    temp = df_3[(df_3['Number of Cores'] == 'Octa') & (df_3['Processor Brand'] == 'Snapdragon')]
-    # Group by processor model and aggregate count and minimum price
-    temp1 = temp.groupby('Processor Model').agg({'Price (INR)': ['count', 'min']}).reset_index()
-    temp1.columns = ['Processor Model', 'Count', 'Min Price']
-    # Create a bar plot for Snapdragon Octa-Core processor models
-    sns.set(style="whitegrid")
-    fig, ax = plt.subplots(figsize=(25, 13))
-    sns.barplot(data=temp1, x='Processor Model', y='Count', hue='Min Price', palette='plasma', ax=ax)
-    ax.set_xlabel('Processor Model', fontsize=25)
-    ax.set_ylabel('Count of Processors', fontsize=25)
-    ax.set_title('Count vs Processor Model (Snapdragon Octa-Core)', fontsize=25)
-    plt.xticks(rotation=45, ha="right", fontsize=23)
-    plt.yticks(rotation=45, ha="right", fontsize=23)
-    plt.legend(fontsize=25, title="Min Price", title_fontsize=23, loc="upper right", markerscale=7)
-    plt.tight_layout()
-    st.pyplot(fig)
-    
-    # Filter for MediaTek Dimensity Octa-Core processors
-    temp = df_3[(df_3['Number of Cores'] == 'Octa') & (df_3['Processor Brand'] == 'MediaTek Dimensity')]
-    # Group by processor model and aggregate count and minimum price
-    temp1 = temp.groupby('Processor Model').agg({'Price (INR)': ['count', 'min']}).reset_index()
-    temp1.columns = ['Processor Model', 'Count', 'Min Price']
-    # Create a bar plot for MediaTek Dimensity Octa-Core processor models
-    sns.set(style="whitegrid")
-    fig, ax = plt.subplots(figsize=(23, 12))
-    sns.barplot(data=temp1, x='Processor Model', y='Count', hue='Min Price', palette='plasma', ax=ax)
-    ax.set_xlabel('Processor Model', fontsize=25)
-    ax.set_ylabel('Count of Processors', fontsize=25)
-    ax.set_title('Count vs Processor Model (MediaTek Dimensity Octa-Core)', fontsize=25)
-    plt.xticks(rotation=45, ha="right", fontsize=23)
-    plt.yticks(rotation=45, ha="right", fontsize=23)
-    plt.legend(fontsize=23, title="Min Price", title_fontsize=20, loc="upper right", markerscale=5)
-    plt.tight_layout()
-    st.pyplot(fig)
+    # Bar plots of Snapdragon and MediaTek Dimensity Octa-Core processor models, rendered once to PNG
+    st.image(get_cache().get_or_compute(cache_key('processor_models', df_version, 'Snapdragon'),
+                                        partial(processor_model_png, df_3, 'Snapdragon', 'Snapdragon', (25, 13), 25, 23, 7)),
+             use_container_width=True)
+    st.image(get_cache().get_or_compute(cache_key('processor_models', df_version, 'MediaTek Dimensity'),
+                                        partial(processor_model_png, df_3, 'MediaTek Dimensity', 'MediaTek Dimensity', (23, 12), 23, 20, 5)),
+             use_container_width=True)
     
     st.markdown("""
     
@@ -487,20 +722,12 @@ elif selection == "Overall Analysis 📊":
     
     col1, col2 = st.columns(2)
     with col1:
-        temp = df_3[(df_3['Number of Cores'] == 'Octa') & (df_3['Processor Brand'] == 'Snapdragon')]
-        ram_distribution = temp.groupby('RAM (GB)').agg(price=('Price (INR)', 'mean'), count=('RAM (GB)', 'size')).reset_index()
-        ram_distribution.rename(columns={'price': 'Mean Price'}, inplace=True)
-        ram_distribution['Mean Price'] = ram_distribution['Mean Price'].round(0)
-        fig = px.pie(ram_distribution, names='RAM (GB)', values='count', title="Distribution of RAM's for Octa-core Snapdragon",
-                 hover_data={'Mean Price': True}, hole=0.4)
+        fig = get_cache().get_or_compute(cache_key('octa_core_donut', df_version, 'Snapdragon', 'RAM (GB)'),
+                                         partial(octa_core_donut_figure, df_3, 'Snapdragon', 'RAM (GB)', "Distribution of RAM's for Octa-core Snapdragon"))
         st.plotly_chart(fig)
     with col2:
-        temp = df_3[(df_3['Number of Cores'] == 'Octa') & (df_3['Processor Brand'] == 'MediaTek Dimensity')]
-        ram_distribution = temp.groupby('RAM (GB)').agg(price=('Price (INR)', 'mean'), count=('RAM (GB)', 'size')).reset_index()
-        ram_distribution.rename(columns={'price': 'Mean Price'}, inplace=True)
-        ram_distribution['Mean Price'] = ram_distribution['Mean Price'].round(0)
-        fig = px.pie(ram_distribution, names='RAM (GB)', values='count', title="Distribution of RAM's for Octa-core MediaTek",
-                 hover_data={'Mean Price': True}, hole=0.4)
+        fig = get_cache().get_or_compute(cache_key('octa_core_donut', df_version, 'MediaTek Dimensity', 'RAM (GB)'),
+                                         partial(octa_core_donut_figure, df_3, 'MediaTek Dimensity', 'RAM (GB)', "Distribution of RAM's for Octa-core MediaTek"))
         st.plotly_chart(fig)
         
     col3, col4 = st.columns(2)
@@ -531,20 +758,12 @@ elif selection == "Overall Analysis 📊":
     st.markdown("""<div style="text-align: center;font-size: 25px; font-weight: bold;">Brand Distribution </div>""", unsafe_allow_html=True)
     col5, col6 = st.columns(2)
     with col5:
-        temp = df_3[(df_3['Number of Cores'] == 'Octa') & (df_3['Processor Brand'] == 'Snapdragon')]
-        brand_distribution = temp.groupby('Brand').agg(price=('Price (INR)', 'mean'), count=('Brand', 'size')).reset_index()
-        brand_distribution.rename(columns={'price': 'Mean Price'}, inplace=True)
-        brand_distribution['Mean Price'] = brand_distribution['Mean Price'].round(0)
-        fig = px.pie(brand_distribution, names='Brand', values='count', title="Distribution of Brands for Octa-core Snapdragon",
-                 hover_data={'Mean Price': True}, hole=0.4)
+        fig = get_cache().get_or_compute(cache_key('octa_core_donut', df_version, 'Snapdragon', 'Brand'),
+                                         partial(octa_core_donut_figure, df_3, 'Snapdragon', 'Brand', "Distribution of Brands for Octa-core Snapdragon"))
         st.plotly_chart(fig)
     with col6:
-        temp = df_3[(df_3['Number of Cores'] == 'Octa') & (df_3['Processor Brand'] == 'MediaTek Dimensity')]
-        brand_distribution = temp.groupby('Brand').agg(price=('Price (INR)', 'mean'), count=('Brand', 'size')).reset_index()
-        brand_distribution.rename(columns={'price': 'Mean Price'}, inplace=True)
-        brand_distribution['Mean Price'] = brand_distribution['Mean Price'].round(0)
-        fig = px.pie(brand_distribution, names='Brand', values='count', title="Distribution of Brands for Octa-core MediaTek",
-                 hover_data={'Mean Price': True}, hole=0.4)
+        fig = get_cache().get_or_compute(cache_key('octa_core_donut', df_version, 'MediaTek Dimensity', 'Brand'),
+                                         partial(octa_core_donut_figure, df_3, 'MediaTek Dimensity', 'Brand', "Distribution of Brands for Octa-core MediaTek"))
         st.plotly_chart(fig)
 
     col7, col8 = st.columns(2)
@@ -576,14 +795,16 @@ elif selection == "Overall Analysis 📊":
    # Show User-centric Analysis
 elif selection == "User-centric Analysis 👥":
     st.title("User-centric Analysis")
-    file_path_1=r"https://raw.githubusercontent.com/soliloquy-data/Smartphone-Analysis-Dashboard/refs/heads/main/Data/data_refined_user.csv"
-    df1 = pd.read_csv(file_path_1)
+    df1, df1_version = load_dataset(file_path_1)
+    get_prewarmer().schedule(f"criteria:{df1_version}", partial(criteria_tasks, df1, df1_version))
     st.markdown("""
 
     Welcome to the **Smartphone Selection Tool** – an interactive platform designed to help you find the ideal smartphone that meets your exact preferences and needs.
 
     This analysis focuses on key factors that matter to most users :
 
+    - **Find a Phone**: Search by model name, brand or processor to jump straight to a phone's full specifications.
+
     - **Your Smartphone, Your Criteria**: Filtering by Brand , Release Year, and Price Range to narrow down the best options based on your preferences and budget.
   
     - **Top 7's By Key Features** : Feature Selection to showcase smartphones with the highest specifications in each year and brand, helping you compare the most feature-rich options available.
@@ -593,6 +814,24 @@ elif selection == "User-centric Analysis 👥":
     """)
 
 
+    st.subheader("Find a Phone")
+    st.markdown("""
+    Type a model name, brand or processor, e.g. **galaxy s24**, **redmi note 13** or **dimensity 7200**. Matching is typo-tolerant, so close spellings still find the phone. Pick a match to view its full specifications.
+    """)
+    search_query = st.text_input("Search for a phone", placeholder="e.g. galaxy s24")
+    if search_query.strip():
+        matches = get_search_index(df1_version, df1).search(search_query, limit=10)
+        if len(matches) > 0:
+            # Pick one of the ranked matches and show its full spec row
+            match = st.selectbox("Matching phones", range(len(matches)),
+                                 format_func=lambda i: f"{matches['Model Name'].iloc[i]} ({matches['Release Year'].iloc[i]}, ₹{matches['Price (INR)'].iloc[i]:,.0f})")
+            phone = matches.iloc[match].drop('Score')
+            st.write(f"##### {phone['Model Name']}")
+            st.dataframe(phone.astype(str).to_frame('Specification'), use_container_width=True)
+        else:
+            st.write("No phones match your search, try a different spelling or fewer words.")
+
+
     # Filter data based on user input
     st.subheader("Your Smartphone, Your Criteria")
 
@@ -611,23 +850,13 @@ elif selection == "User-centric Analysis 👥":
 
     with col1:
         brand_options = ['All Brands'] + list(df1['Brand'].unique())
-        selected_brand = st.selectbox("Select a brand", brand_options)
-        if selected_brand != 'All Brands':
-            df_brand = df1[df1['Brand'] == selected_brand]
-        else:
-            df_brand = df1  # Handle 'All Brands' case
+        selected_brand = st.selectbox("Select a brand", brand_options)  # 'All Brands' skips the brand filter
 
     with col2:
         year_options = ['All years'] + list(df1['Release Year'].unique())
-        selected_year = st.selectbox("Select a year", year_options)
-        if selected_year != 'All years':
-            df_year = df_brand[df_brand['Release Year'] == selected_year]
-        else:
-            df_year = df_brand  # Handle 'All years' case
+        selected_year = st.selectbox("Select a year", year_options)  # 'All years' skips the year filter
 
     with col3:
-        price_bins_1 = [0, 10000, 15000, 20000, 30000, 40000, 50000, 60000, 70000, 80000, 90000, 100000, 125000, 150000, 200000]
-        price_labels_1 = ['0-10k', '10k-15k', '15k-20k', '20k-30k', '30k-40k', '40k-50k', '50k-60k', '60k-70k', '70k-80k', '80k-90k', '90k-1L', '1L-1.25L', '1.25L-1.5L', '1.5L-2L']
         selected_price_range = st.selectbox("Price Range", price_labels_1)
     
     if selected_price_range == "1.25L-1.5L":
@@ -637,17 +866,11 @@ elif selection == "User-centric Analysis 👥":
         st.write("🎉 You Sassier Rich Member of Society 🎉")
         st.snow()  # Trigger the Streamlit built-in snow effect
 
-    # Apply price bins to the data
-    df_year['Price Range'] = pd.cut(df_year['Price (INR)'], bins=price_bins_1, labels=price_labels_1, right=False)
-
-    # Filter data based on the selected price range
-    filtered_df = df_year[df_year['Price Range'] == selected_price_range]
-
-    # Sort data by 'Price (INR)'
-    filtered_df = filtered_df.sort_values(by='Price (INR)', ascending=False)
-
-    # Assign the index to 'Model Name'
-    filtered_df.index = filtered_df['Model Name']
+    # Filter by brand, year and price range, sorted by price with 'Model Name' as the index
+    criteria_state = (selected_brand, selected_year, selected_price_range)
+    record_pick('criteria', criteria_state)
+    filtered_df = get_cache().get_or_compute(cache_key('criteria', df1_version, *criteria_state),
+                                             partial(criteria_table, df1, *criteria_state))
 
     # Show the filtered data with selected columns
     st.write(filtered_df[['Brand', 'Price (INR)','Processor Brand', 'Processor Model', 'Number of Cores', 'ROM (GB)', 
@@ -670,16 +893,10 @@ elif selection == "User-centric Analysis 👥":
     """)
     
     # Streamlit user input for selecting a feature to color the bars
-    feature_options = ['RAM (GB)', 'ROM (GB)','Processor Brand' ,'Battery Capacity (mAh)','Total Front Camera Megapixels','Total Rear Camera Megapixels',
-                      'Display Size (cm)','Fast Charge Capacity (W)','5G Support', 'Fingerprint Sensor', 'NFC Support']
     selected_feature = st.selectbox("Select a feature to color the bars", feature_options)
-    filtered_df[selected_feature] = filtered_df[selected_feature].astype(str)
-    # Create a bar plot with dynamic color based on the selected feature
     if  selected_brand != 'All Brands' and selected_year != 'All years' :
-        fig = px.bar(filtered_df, x='Model Name', y='Price (INR)',color=selected_feature, 
-        title=f"Price vs Model Name Colored by {selected_feature}",
-        labels={"Price (INR)": "Price (INR)", "Model Name": "Phone Model"},
-        color_continuous_scale='Cividis')  # You can change the color scale if needed
+        fig = get_cache().get_or_compute(cache_key('criteria_fig', df1_version, *criteria_state, selected_feature),
+                                         partial(criteria_figure, filtered_df, selected_feature))
         st.plotly_chart(fig)
         
     else:
@@ -756,3 +973,77 @@ elif selection == "User-centric Analysis 👥":
 
         st.write("Please select at least one feature to compare the top 7 smartphones.")
 
+    ##############################################################################################################################
+
+# Ad-hoc SQL over both datasets
+elif selection == "Ad-hoc Query 🔎":
+    st.title("Ad-hoc Query")
+    df, df_version = load_dataset(file_path)
+    df1, df1_version = load_dataset(file_path_1)
+    engine = get_query_engine((df_version, df1_version), {'phones': df, 'phones_user': df1})
+    st.markdown("""
+    Explore views that the fixed sections don't cover by writing a **SQL query** (SQLite dialect) over the refined datasets:
+
+    - **phones**: the full dataset used in the Overall Analysis.
+    - **phones_user**: the filtered dataset used in the User-centric Analysis.
+
+    Column names contain spaces, so quote them, e.g. `"Price (INR)"`. Only read-only `SELECT` queries are allowed, and each query is limited in run time and returned rows.
+    """)
+    with st.expander("Columns"):
+        st.write(pd.DataFrame({'Column': engine.tables['phones']}))
+
+    sql = st.text_area("SQL query", height=150, value='''SELECT Brand, COUNT(*) AS "Count of Phones", ROUND(AVG("Price (INR)")) AS "Mean Price"
+FROM phones
+GROUP BY Brand
+ORDER BY "Count of Phones" DESC''')
+    col1, col2 = st.columns(2)
+    with col1:
+        max_rows = st.number_input("Row limit", min_value=10, max_value=10000, value=1000, step=100)
+    with col2:
+        timeout = st.number_input("Time limit (seconds)", min_value=0.5, max_value=10.0, value=2.0, step=0.5)
+
+    # Identical queries (up to formatting) against the same data are served from the shared cache
+    try:
+        result, truncated = get_cache().get_or_compute(
+            cache_key('query', df_version, df1_version, normalize_sql(sql), int(max_rows)),
+            partial(engine.run, sql, max_rows=int(max_rows), timeout=timeout))
+    except QueryError as exc:
+        st.error(str(exc))
+    else:
+        if truncated:
+            st.warning(f"Showing the first {int(max_rows)} rows only.")
+        st.dataframe(result)
+
+        # Chart the result with Plotly Express, which copes with whatever column types the query returns
+        chart_types = ['None', 'Bar', 'Line', 'Scatter', 'Pie', 'Histogram']
+        chart_type = st.selectbox("Chart the result", chart_types)
+        if chart_type != 'None' and len(result.columns) > 0:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                x = st.selectbox("X axis / names", result.columns)
+            with col2:
+                y = st.selectbox("Y axis / values", result.columns, index=min(1, len(result.columns) - 1))
+            with col3:
+                color = st.selectbox("Color", ['None'] + list(result.columns))
+            color = None if color == 'None' else color
+            title = f"{y} by {x}"
+            if chart_type == 'Bar':
+                fig = px.bar(result, x=x, y=y, color=color, title=title)
+            elif chart_type == 'Line':
+                fig = px.line(result, x=x, y=y, color=color, title=title, markers=True)
+            elif chart_type == 'Scatter':
+                fig = px.scatter(result, x=x, y=y, color=color, title=title)
+            elif chart_type == 'Pie':
+                fig = px.pie(result, names=x, values=y, title=title, hole=0.4)
+            else:
+                fig = px.histogram(result, x=x, color=color, title=f'Histogram of {x}', template='plotly_dark', nbins=30)
+                fig.update_layout(bargap=0.3)
+            st.plotly_chart(fig)
+
+
+# Shared cache and prewarm metrics, for operators only
+if show_cache_metrics:
+    with st.sidebar.expander("Cache metrics"):
+        st.json({**get_cache().stats(), **get_prewarmer().stats()})
+
+get_prewarmer().rerun_finished(rerun_session)
@@ -0,0 +1,64 @@
+# Per-chart construction time of Plotly Express vs the figures module, on the local dataset.
+#
+#   python Script/bench_figures.py [repeats]
+#
+# Each chart is built `repeats` times with both paths and then serialised the way
+# st.plotly_chart does (plotly.io.to_json without validation), once with each JSON engine.
+# Plotly's default engine ('auto') already picks orjson when it is installed.
+import os
+import sys
+import timeit
+
+import pandas as pd
+import plotly.express as px
+import plotly.io as pio
+
+import figures
+
+df = pd.read_csv(os.path.join(os.path.dirname(__file__), '..', 'Data', 'data_refined.csv'))
+repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+pie_data = df['Processor Brand'].value_counts().reset_index(name='Count')
+brand_counts = df['Brand'].value_counts().reset_index(name='Count of Phones')
+brand_models = (df[df['Brand'] == 'Samsung'].groupby(['Release Year', 'Model Name']).size()
+                .reset_index(name='Count of Phones'))
+trends = df.groupby(['Release Year', 'Operating System Type'])['Price (INR)'].mean().reset_index()
+cores = df.groupby('Number of Cores')['Processor Brand'].value_counts().reset_index()
+
+charts = {
+    'pie': (lambda: px.pie(pie_data, values='Count', names='Processor Brand', hover_data=['Count'], hole=0.4),
+            lambda: figures.pie(pie_data, values='Count', names='Processor Brand', hover_data=['Count'], hole=0.4)),
+    'histogram': (lambda: px.histogram(df, x='Price (INR)', template='plotly_dark', nbins=30),
+                  lambda: figures.histogram(df, x='Price (INR)', template='plotly_dark', nbins=30)),
+    'bar (one colour per brand)': (lambda: px.bar(brand_counts, x='Brand', y='Count of Phones', color='Brand'),
+                                   lambda: figures.bar(brand_counts, x='Brand', y='Count of Phones', color='Brand')),
+    'bar (stacked models)': (lambda: px.bar(brand_models, x='Release Year', y='Count of Phones', color='Model Name'),
+                             lambda: figures.bar(brand_models, x='Release Year', y='Count of Phones', color='Model Name')),
+    'bar (core count)': (lambda: px.bar(cores, x='Number of Cores', y='count', color='Processor Brand'),
+                         lambda: figures.bar(cores, x='Number of Cores', y='count', color='Processor Brand')),
+    'line': (lambda: px.line(trends, x='Release Year', y='Price (INR)', color='Operating System Type', markers=True),
+             lambda: figures.line(trends, x='Release Year', y='Price (INR)', color='Operating System Type', markers=True)),
+}
+
+
+try:
+    import orjson  # noqa: F401
+    engines = ['json', 'orjson']
+except ImportError:
+    engines = ['json']
+
+
+def per_chart_ms(build, engine):
+    # Warm-up call first, so the cached layouts/templates of both paths are resolved
+    pio.to_json(build(), validate=False, engine=engine)
+    seconds = timeit.timeit(lambda: pio.to_json(build(), validate=False, engine=engine), number=repeats)
+    return seconds / repeats * 1000
+
+
+print(f"{repeats} repeats")
+for engine in engines:
+    print(f"\nJSON engine: {engine}")
+    print(f"{'chart':<28}{'px (ms)':>10}{'figures (ms)':>14}{'speed-up':>10}")
+    for name, (slow, fast) in charts.items():
+        before, after = per_chart_ms(slow, engine), per_chart_ms(fast, engine)
+        print(f"{name:<28}{before:>10.2f}{after:>14.2f}{before / after:>9.1f}x")
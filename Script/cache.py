@@ -0,0 +1,127 @@
+import pickle
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+# Rough in-memory footprint of a cached value, used to keep the cache under its budget
+def estimate_size(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_size(item) for item in value)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+class ResultCache:
+    """Thread-safe LRU cache for computed frames and figures, bounded by bytes.
+
+    Shared by every session of the app (see `get_cache` in app.py) and filled both by
+    interactive reruns and by the background prewarmer. With a `store` (a DiskCache),
+    memory misses fall back to disk and new entries are written through to it.
+    """
+
+    def __init__(self, max_bytes, store=None):
+        self.max_bytes = max_bytes
+        self.store = store
+        self._items = OrderedDict()  # key -> (value, size)
+        self._prewarmed = set()      # keys inserted by the prewarmer and not yet read
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.prewarm_hits = 0
+        self.prewarmed = 0
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                if key in self._prewarmed:
+                    self._prewarmed.discard(key)
+                    self.prewarm_hits += 1
+                return item[0]
+        value = self.load_persisted(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return default
+            self.disk_hits += 1
+            return value
+
+    def load_persisted(self, key, prewarmed=False):
+        # Promote an entry from the disk store into memory; None if there is none
+        if self.store is None:
+            return None
+        value = self.store.get(key)
+        if value is not None:
+            self.put(key, value, evict=not prewarmed, prewarmed=prewarmed, persist=False)
+        return value
+
+    def put(self, key, value, size=None, evict=True, prewarmed=False, persist=True):
+        # Returns False when the value does not fit in memory; with evict=False nothing
+        # already cached is dropped to make room (the prewarmer never pushes out real traffic)
+        if persist and self.store is not None:
+            self.store.put(key, value)
+        if size is None:
+            size = estimate_size(value)
+        with self._lock:
+            if key in self._items:
+                self._nbytes -= self._items.pop(key)[1]
+                self._prewarmed.discard(key)
+            if size > self.max_bytes:
+                return False
+            if self._nbytes + size > self.max_bytes:
+                if not evict:
+                    return False
+                while self._nbytes + size > self.max_bytes:
+                    old_key, (_, old_size) = self._items.popitem(last=False)
+                    self._prewarmed.discard(old_key)
+                    self._nbytes -= old_size
+            self._items[key] = (value, size)
+            self._nbytes += size
+            if prewarmed:
+                self._prewarmed.add(key)
+                self.prewarmed += 1
+            return True
+
+    def get_or_compute(self, key, compute):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            stats = {
+                'entries': len(self._items),
+                'bytes': self._nbytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'hit_rate': round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                'prewarmed': self.prewarmed,
+                'prewarm_hits': self.prewarm_hits,
+            }
+        if self.store is not None:
+            stats.update(self.store.stats())
+        return stats
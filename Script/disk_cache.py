@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import plotly.graph_objects as go
+import pyarrow as pa
+
+try:
+    import fcntl
+except ImportError:  # Windows: eviction is still safe, just not serialised across processes
+    fcntl = None
+
+
+_INDEX = '__index__'
+
+
+def _frame_to_arrow(frame):
+    table = pa.Table.from_pandas(frame.rename_axis(_INDEX), preserve_index=None)
+    meta = dict(table.schema.metadata or {})
+    meta[b'index_name'] = json.dumps(frame.index.name).encode()
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema.with_metadata(meta)) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _frame_from_arrow(data):
+    table = pa.ipc.open_file(pa.py_buffer(data)).read_all()
+    frame = table.to_pandas()
+    frame.index.name = json.loads(table.schema.metadata[b'index_name'])
+    return frame
+
+
+# Each supported value type maps to a file extension: frames -> Arrow IPC, Plotly figures
+# (or tuples of them) -> JSON, rendered Matplotlib charts -> PNG bytes
+def _serialize(value):
+    if isinstance(value, pd.DataFrame) and value.index.nlevels == 1:
+        return 'arrow', _frame_to_arrow(value)
+    if isinstance(value, go.Figure):
+        return 'json', value.to_json().encode()
+    if isinstance(value, tuple) and value and all(isinstance(v, go.Figure) for v in value):
+        return 'json', ('[' + ','.join(v.to_json() for v in value) + ']').encode()
+    if isinstance(value, bytes) and value.startswith(b'\x89PNG'):
+        return 'png', value
+    return None, None
+
+
+def _deserialize(ext, data):
+    if ext == 'arrow':
+        return _frame_from_arrow(data)
+    if ext == 'json':
+        # Written by Figure.to_json, so already valid; skip re-validating data and template.
+        # Cached figures are shared and only rendered, never updated in place
+        loaded = json.loads(data)
+        if isinstance(loaded, list):
+            return tuple(go.Figure(fig, _validate=False) for fig in loaded)
+        return go.Figure(loaded, _validate=False)
+    return data
+
+
+class DiskCache:
+    """Size-bounded LRU cache of derived frames and figures on local disk.
+
+    Survives restarts and can be shared by several worker processes: entries are written
+    to a temporary file and atomically renamed into place, reads bump the file's mtime
+    (the LRU clock) and eviction runs under an exclusive lock file. Keys are tuples that
+    callers build from the section's code version and the dataset content hash.
+    """
+
+    EXTENSIONS = ('arrow', 'json', 'png')
+    # Temporary files older than this were left by a writer that died before renaming them
+    STALE_TMP_SECONDS = 3600
+    # Rescan the directory at least this often, to account for other processes' writes
+    RESCAN_EVERY = 100
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._evict()
+
+    def _path(self, key, ext):
+        # str() of each part so numpy scalars and builtins (e.g. years) give the same name
+        digest = hashlib.sha256(json.dumps([str(part) for part in key]).encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.{ext}")
+
+    def get(self, key):
+        # Returns None on a miss, including files evicted or corrupted by another process
+        for ext in self.EXTENSIONS:
+            path = self._path(key, ext)
+            try:
+                with open(path, 'rb') as fh:
+                    data = fh.read()
+                os.utime(path)
+            except OSError:
+                continue
+            try:
+                return _deserialize(ext, data)
+            except Exception:
+                return None
+        return None
+
+    def put(self, key, value):
+        # Returns False for values that have no on-disk format or fail to serialise
+        # (e.g. pyarrow rejecting an object column of mixed types)
+        try:
+            ext, data = _serialize(value)
+        except Exception:
+            return False
+        if ext is None:
+            return False
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        except OSError:
+            return False
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(data)
+            os.replace(tmp, self._path(key, ext))
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return False
+        # Totals from the last scan plus this process's writes since; only rescan (and
+        # evict) when that passes the budget or after RESCAN_EVERY writes
+        self._entries_count += 1
+        self._bytes += len(data)
+        self._writes_since_scan += 1
+        if self._bytes > self.max_bytes or self._writes_since_scan >= self.RESCAN_EVERY:
+            self._evict()
+        return True
+
+    @contextmanager
+    def _locked(self):
+        with open(os.path.join(self.directory, '.lock'), 'a') as fh:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _entries(self):
+        # Cache entries as (mtime, size, path); stale temporary files are removed on the way
+        entries = []
+        stale = time.time() - self.STALE_TMP_SECONDS
+        for entry in os.scandir(self.directory):
+            ext = entry.name.rpartition('.')[2]
+            if ext not in self.EXTENSIONS and ext != 'tmp':
+                continue
+            try:
+                stat = entry.stat()
+                if ext == 'tmp':
+                    if stat.st_mtime < stale:
+                        os.unlink(entry.path)
+                    continue
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self):
+        with self._locked():
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            count = len(entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+                total -= size
+                count -= 1
+        self._entries_count, self._bytes, self._writes_since_scan = count, total, 0
+
+    def stats(self):
+        # As of the last scan plus this process's writes since, so no directory scan here
+        return {'disk_entries': self._entries_count, 'disk_bytes': self._bytes, 'disk_max_bytes': self.max_bytes}
@@ -0,0 +1,129 @@
+from functools import lru_cache
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+
+# Fast replacements for the px.bar/line/pie/histogram calls used by the app.
+#
+# Plotly Express reshapes the DataFrame, validates its arguments and resolves the template
+# on every call. Here the layout for each chart type (template included) is validated once
+# and cached; a call only slices the data into per-colour traces and fills in titles, and
+# the figure is assembled without validating it all again. The traces carry the same
+# colours, hover text and legend groups that px would produce.
+
+
+@lru_cache(maxsize=None)
+def _base_layout(kind, template=None):
+    template = pio.templates[template or pio.templates.default]
+    layout = go.Layout(template=template, margin={'t': 60})
+    if kind in ('bar', 'histogram'):
+        layout.barmode = 'relative'
+    return layout.to_plotly_json()
+
+
+@lru_cache(maxsize=None)
+def _colorway(template=None):
+    template = pio.templates[template or pio.templates.default]
+    return tuple(template.layout.colorway or ('#636efa',))
+
+
+def _label(labels, col):
+    return (labels or {}).get(col, col)
+
+
+def _hover_fields(fields, hover_data):
+    # `fields` are the (column, reference) pairs px would show; hover_data can hide them or
+    # add more columns, which are passed to the trace as customdata
+    hover_data = dict.fromkeys(hover_data, True) if isinstance(hover_data, list) else dict(hover_data or {})
+    shown = [(col, ref) for col, ref in fields if col is not None and hover_data.get(col, True)]
+    extra = [col for col, show in hover_data.items() if show and col not in dict(fields)]
+    shown += [(col, f'%{{customdata[{i}]}}') for i, col in enumerate(extra)]
+    return shown, extra
+
+
+def _hovertemplate(fields, labels, value=None):
+    # A reference of None stands for the trace's colour value, which is constant per trace
+    parts = [f'{_label(labels, col)}={value if ref is None else ref}' for col, ref in fields]
+    return '<br>'.join(parts) + '<extra></extra>'
+
+
+def _groups(frame, color):
+    if color is None:
+        return [(None, frame)]
+    return list(frame.groupby(color, sort=False))
+
+
+def _figure(kind, traces, title, template=None, xaxis=None, yaxis=None, legend=None):
+    layout = dict(_base_layout(kind, template))
+    if title is not None:
+        layout['title'] = {'text': title}
+    layout['legend'] = {'tracegroupgap': 0}
+    if legend is not None:
+        layout['legend']['title'] = {'text': legend}
+    if kind != 'pie':
+        layout['xaxis'] = {'anchor': 'y', 'domain': [0.0, 1.0], 'title': {'text': xaxis}}
+        layout['yaxis'] = {'anchor': 'x', 'domain': [0.0, 1.0], 'title': {'text': yaxis}}
+    # Traces and layout are built here in plotly's own form, so validation is skipped while
+    # assembling the figure and only turned back on for updates made by the caller
+    fig = go.Figure(data=traces, layout=layout, _validate=False)
+    fig._validate = fig.layout._validate = True
+    for trace in fig.data:
+        trace._validate = True
+    return fig
+
+
+def _xy_traces(trace_type, frame, x, y, color, labels, hover_data, colors, extra_props):
+    colors = colors or _colorway()
+    color_field = [] if color in (None, x, y) else [(color, None)]
+    fields, extra = _hover_fields(color_field + [(x, '%{x}'), (y, '%{y}')], hover_data)
+    traces = []
+    for i, (value, group) in enumerate(_groups(frame, color)):
+        name = '' if color is None else str(value)
+        trace = {'type': trace_type, 'x': group[x].to_numpy(), 'y': group[y].to_numpy(),
+                 'name': name, 'legendgroup': name, 'showlegend': color is not None,
+                 'hovertemplate': _hovertemplate(fields, labels, value)}
+        if extra:
+            trace['customdata'] = group[extra].to_numpy()
+        trace.update(extra_props(colors[i % len(colors)], name))
+        traces.append(trace)
+    return traces
+
+
+def bar(frame, x, y, color=None, title=None, labels=None, hover_data=None, colors=None):
+    traces = _xy_traces('bar', frame, x, y, color, labels, hover_data, colors,
+                        lambda c, name: {'marker': {'color': c, 'pattern': {'shape': ''}}, 'orientation': 'v',
+                                         'alignmentgroup': 'True', 'offsetgroup': name, 'textposition': 'auto'})
+    return _figure('bar', traces, title, xaxis=_label(labels, x), yaxis=_label(labels, y),
+                   legend=None if color is None else _label(labels, color))
+
+
+def line(frame, x, y, color=None, title=None, labels=None, hover_data=None, colors=None,
+         markers=False, line_shape='linear'):
+    mode = 'lines+markers' if markers else 'lines'
+    traces = _xy_traces('scatter', frame, x, y, color, labels, hover_data, colors,
+                        lambda c, name: {'mode': mode, 'marker': {'symbol': 'circle'},
+                                         'line': {'color': c, 'dash': 'solid', 'shape': line_shape}})
+    return _figure('line', traces, title, xaxis=_label(labels, x), yaxis=_label(labels, y),
+                   legend=None if color is None else _label(labels, color))
+
+
+def pie(frame, names, values, title=None, labels=None, hover_data=None, hole=0):
+    fields, extra = _hover_fields([(names, '%{label}'), (values, '%{value}')], hover_data)
+    trace = {'type': 'pie', 'labels': frame[names].to_numpy(), 'values': frame[values].to_numpy(),
+             'domain': {'x': [0.0, 1.0], 'y': [0.0, 1.0]}, 'hole': hole, 'name': '', 'legendgroup': '',
+             'showlegend': True, 'hovertemplate': _hovertemplate(fields, labels)}
+    if extra:
+        trace['customdata'] = frame[extra].to_numpy()
+    return _figure('pie', [trace], title)
+
+
+def histogram(frame, x, title=None, labels=None, nbins=None, template=None):
+    trace = {'type': 'histogram', 'x': frame[x].to_numpy(), 'bingroup': 'x',
+             'name': '', 'legendgroup': '', 'showlegend': False, 'orientation': 'v',
+             'alignmentgroup': 'True', 'offsetgroup': '',
+             'marker': {'color': _colorway(template)[0], 'pattern': {'shape': ''}},
+             'hovertemplate': f'{_label(labels, x)}=%{{x}}<br>count=%{{y}}<extra></extra>'}
+    if nbins is not None:
+        trace['nbinsx'] = nbins
+    return _figure('histogram', [trace], title, template=template, xaxis=_label(labels, x), yaxis='count')
@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _lower_thread_priority():
+    # On Linux the nice value is per thread, so this only deprioritises the prewarm worker
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except (AttributeError, OSError):
+        pass
+
+
+class Prewarmer:
+    """Background scheduler that fills a ResultCache with the most likely widget states.
+
+    Each task is a (state, key, compute, weight) tuple. Before every task the pending ones
+    are re-ranked by how often users of this process have picked their state so far
+    (`record_access`) and then by the weight, e.g. the number of rows for that brand.
+    Before each task the worker waits until no rerun is in flight (`rerun_started` /
+    `rerun_finished`) and the last one ended `quiet_period` seconds ago, since its work
+    competes with reruns for the GIL. It stops once the cache holds `budget_bytes`.
+    """
+
+    def __init__(self, cache, budget_bytes, quiet_period=0.5, max_rerun_seconds=30):
+        self.cache = cache
+        self.budget_bytes = budget_bytes
+        self.quiet_period = quiet_period
+        # A run that raised or was interrupted never reports its end; after this long (or
+        # at the session's next rerun) it no longer holds the worker back
+        self.max_rerun_seconds = max_rerun_seconds
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prewarm")
+        self._access = Counter()
+        self._access_changes = 0
+        self._submitted = set()
+        self._running = {}  # session -> start time of its rerun in flight
+        self._last_rerun = time.monotonic()
+        self._lock = threading.Lock()
+        self.computed = 0
+        self.loaded = 0
+        self.skipped = 0
+
+    def rerun_started(self, session):
+        # Called at the top of every script run; a session has at most one run in flight,
+        # so a run interrupted by the next one is replaced rather than leaked
+        with self._lock:
+            self._running[session] = self._last_rerun = time.monotonic()
+
+    def rerun_finished(self, session):
+        # Called at the end of every script run
+        with self._lock:
+            self._running.pop(session, None)
+            self._last_rerun = time.monotonic()
+
+    def record_access(self, state):
+        with self._lock:
+            self._access[state] += 1
+            self._access_changes += 1
+
+    def schedule(self, name, make_tasks):
+        # `name` identifies the batch (section + dataset version); each batch runs once,
+        # so `make_tasks` is only called the first time
+        with self._lock:
+            if name in self._submitted:
+                return False
+            self._submitted.add(name)
+        self._executor.submit(self._run, list(make_tasks()))
+        return True
+
+    def _wait_for_quiet(self):
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                busy = any(now - started < self.max_rerun_seconds for started in self._running.values())
+                idle = now - self._last_rerun
+            if not busy and idle >= self.quiet_period:
+                return
+            time.sleep(0.05 if busy else self.quiet_period - idle)
+
+    def _next_task(self, pending, ranked_at):
+        # `pending` is kept sorted with the best task last; it is only re-sorted when
+        # users picked something since the last ranking
+        with self._lock:
+            changes = self._access_changes
+            if changes != ranked_at:
+                access = dict(self._access)
+        if changes != ranked_at:
+            pending.sort(key=lambda task: (access.get(task[0], 0), task[3]))
+        return pending.pop(), changes
+
+    def _run(self, tasks):
+        _lower_thread_priority()
+        pending, ranked_at = tasks, None
+        while pending:
+            (_, key, compute, _), ranked_at = self._next_task(pending, ranked_at)
+            if self.cache.nbytes >= self.budget_bytes:
+                break
+            if key in self.cache:
+                self.skipped += 1
+                continue
+            self._wait_for_quiet()
+            # Entries persisted by an earlier run only need loading, not recomputing
+            if self.cache.load_persisted(key, prewarmed=True) is not None:
+                self.loaded += 1
+                continue
+            try:
+                value = compute()
+            except Exception:
+                self.skipped += 1
+                continue
+            if not self.cache.put(key, value, evict=False, prewarmed=True):
+                break
+            self.computed += 1
+
+    def stats(self):
+        return {'computed': self.computed, 'loaded': self.loaded, 'skipped': self.skipped, 'tracked_states': len(self._access)}
@@ -0,0 +1,78 @@
+import re
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+
+class QueryError(Exception):
+    pass
+
+
+_QUOTED = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*")""")
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+
+
+# Canonical form of a query, used as its result cache key: comments dropped and whitespace
+# collapsed outside quotes. Case is kept, as it shows up in the result's column names.
+def normalize_sql(sql):
+    parts = _QUOTED.split(sql)
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r"\s+", " ", _COMMENT.sub(" ", parts[i]))
+    return "".join(parts).strip().rstrip(";").strip()
+
+
+class QueryEngine:
+    """Read-only in-memory SQLite database over the refined datasets.
+
+    `tables` maps table names to DataFrames. Queries run one at a time (the connection is
+    shared across sessions) and are wrapped so that filtering, grouping and ordering happen
+    in SQLite and at most `max_rows` rows come back. No string or blob a query produces
+    can exceed `max_value_bytes`.
+    """
+
+    def __init__(self, tables, max_value_bytes=1024 ** 2):
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        for name, frame in tables.items():
+            frame.to_sql(name, self._conn, index=False)
+        self._conn.execute("PRAGMA query_only = ON")
+        # The progress handler cannot interrupt one expensive call such as randomblob(1e9);
+        # cap every string/blob a query can build instead
+        self._conn.setlimit(sqlite3.SQLITE_LIMIT_LENGTH, max_value_bytes)
+        self._lock = threading.Lock()
+        self.tables = {name: list(frame.columns) for name, frame in tables.items()}
+
+    def run(self, sql, max_rows=1000, timeout=2.0):
+        # Returns (DataFrame, truncated); raises QueryError for rejected, failing or slow queries.
+        # The checks use the normalised text, but the query runs as written so column names
+        # and aliases keep their case.
+        normalized = normalize_sql(sql)
+        if not normalized:
+            raise QueryError("Enter a query to run.")
+        if not re.match(r"(select|with)\b", normalized, re.I):
+            raise QueryError("Only SELECT (or WITH ... SELECT) queries are allowed.")
+        if ";" in _QUOTED.sub("", normalized):
+            raise QueryError("Only a single statement can be run at a time.")
+        sql = sql.strip().rstrip(";").strip()
+
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            # Called every few thousand VM instructions; a non-zero return aborts the query
+            self._conn.set_progress_handler(lambda: time.monotonic() > deadline, 10000)
+            try:
+                # The newline keeps a trailing -- comment from swallowing the closing bracket
+                cursor = self._conn.execute(f"SELECT * FROM ({sql}\n) LIMIT {int(max_rows) + 1}")
+                rows = cursor.fetchall()
+                columns = [col[0] for col in cursor.description]
+            except sqlite3.OperationalError as exc:
+                if time.monotonic() > deadline:
+                    raise QueryError(f"Query exceeded the {timeout:g}s time limit.") from exc
+                raise QueryError(str(exc)) from exc
+            except sqlite3.Error as exc:
+                raise QueryError(str(exc)) from exc
+            finally:
+                self._conn.set_progress_handler(None, 0)
+
+        result = pd.DataFrame.from_records(rows[:max_rows], columns=columns)
+        return result, len(rows) > max_rows
@@ -0,0 +1,51 @@
+import re
+from collections import defaultdict
+
+import numpy as np
+
+
+def _words(text):
+    return re.findall(r"[0-9a-z]+", str(text).lower())
+
+
+# Trigrams of each word, padded like PostgreSQL's pg_trgm ("  s", " s2", "s24", "24 ")
+# so that short words and word starts still produce grams
+def trigrams(text):
+    grams = set()
+    for word in _words(text):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class SearchIndex:
+    """Trigram inverted index over the phone catalogue, built once per dataset version.
+
+    Every row is indexed by the trigrams of its `columns`. A query is scored per row by
+    the share of its trigrams the row contains, which tolerates typos and missing words
+    ("galxy s24", "redmi note 13 pro"); ties go to the shorter model name, i.e. the
+    closest match, then the newest release.
+    """
+
+    def __init__(self, frame, columns=('Model Name', 'Brand', 'Processor Brand', 'Processor Model')):
+        self.frame = frame
+        postings = defaultdict(list)
+        for row, values in enumerate(frame[list(columns)].itertuples(index=False)):
+            for gram in trigrams(' '.join(str(value) for value in values)):
+                postings[gram].append(row)
+        self._postings = {gram: np.array(rows, dtype=np.int32) for gram, rows in postings.items()}
+        self._name_length = frame['Model Name'].str.len().to_numpy()
+        self._year = frame['Release Year'].to_numpy()
+
+    def search(self, query, limit=10, min_score=0.4):
+        # Returns matching rows of the indexed frame, best first, with a 'Score' column
+        grams = trigrams(query)
+        hits = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not hits:
+            return self.frame.iloc[:0].assign(Score=[])
+        shared = np.bincount(np.concatenate(hits), minlength=len(self.frame))
+        score = shared / len(grams)
+        rows = np.flatnonzero(score >= min_score)
+        order = np.lexsort((-self._year[rows], self._name_length[rows], -score[rows]))[:limit]
+        rows = rows[order]
+        return self.frame.iloc[rows].assign(Score=np.round(score[rows], 2))